@@ -0,0 +1,90 @@
+import csv
+import io
+import json
+import zlib
+from datetime import datetime, timezone
+from typing import AsyncIterator, Iterable, Optional, Sequence
+
+CONTACT_EXPORT_FIELDS = ("id", "name", "email", "message", "timestamp", "status")
+STATUS_EXPORT_FIELDS = ("id", "client_name", "timestamp")
+
+# Flush a chunk to the client once this many bytes are buffered
+CHUNK_SIZE = 64 * 1024
+CURSOR_BATCH_SIZE = 1000
+
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
+
+
+def _naive_utc(value: datetime) -> datetime:
+    # Timestamps are stored as naive UTC datetimes
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def time_range_filter(since: Optional[datetime], until: Optional[datetime]) -> dict:
+    bounds = {}
+    if since is not None:
+        bounds["$gte"] = _naive_utc(since)
+    if until is not None:
+        bounds["$lt"] = _naive_utc(until)
+    return {"timestamp": bounds} if bounds else {}
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+async def ndjson_chunks(cursor, fields: Sequence[str]) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    async for doc in cursor:
+        buffer.write(json.dumps({f: doc.get(f) for f in fields}, default=_json_default,
+                                ensure_ascii=False, separators=(",", ":")))
+        buffer.write("\n")
+        if buffer.tell() >= CHUNK_SIZE:
+            yield buffer.getvalue().encode("utf-8")
+            buffer = io.StringIO()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+async def csv_chunks(cursor, fields: Sequence[str]) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    async for doc in cursor:
+        writer.writerow([
+            value.isoformat() if isinstance(value, datetime) else value
+            for value in (doc.get(f) for f in fields)
+        ])
+        if buffer.tell() >= CHUNK_SIZE:
+            yield buffer.getvalue().encode("utf-8")
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+async def gzip_chunks(chunks: AsyncIterator[bytes], level: int = 6) -> AsyncIterator[bytes]:
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    async for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def export_stream(collection, fields: Iterable[str], fmt: str,
+                  since: Optional[datetime], until: Optional[datetime],
+                  compress: bool = False) -> AsyncIterator[bytes]:
+    """Stream a collection oldest first without materializing it"""
+    fields = tuple(fields)
+    cursor = (
+        collection.find(time_range_filter(since, until), {"_id": 0})
+        .sort("timestamp", 1)
+        .batch_size(CURSOR_BATCH_SIZE)
+    )
+    chunks = csv_chunks(cursor, fields) if fmt == "csv" else ndjson_chunks(cursor, fields)
+    return gzip_chunks(chunks) if compress else chunks
@@ -0,0 +1,56 @@
+import base64
+import json
+from datetime import datetime
+from typing import Iterable, Optional, Tuple
+
+# Newest first; id breaks ties between messages sharing a timestamp
+KEYSET_SORT = [("timestamp", -1), ("id", -1)]
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(doc: dict) -> str:
+    """Opaque cursor pointing just past doc in KEYSET_SORT order"""
+    raw = json.dumps({"t": doc["timestamp"].isoformat(), "i": doc["id"]}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(raw["t"]), str(raw["i"])
+    except (ValueError, KeyError, TypeError) as e:
+        raise InvalidCursor(cursor) from e
+
+
+def keyset_filter(cursor: Optional[str]) -> dict:
+    """Mongo filter selecting documents after the cursor position"""
+    if not cursor:
+        return {}
+    timestamp, doc_id = decode_cursor(cursor)
+    return {"$or": [
+        {"timestamp": {"$lt": timestamp}},
+        {"timestamp": timestamp, "id": {"$lt": doc_id}},
+    ]}
+
+
+def parse_fields(fields: Optional[str], allowed: Iterable[str]) -> Optional[Tuple[str, ...]]:
+    """Validate a comma separated field list; sort keys are always included"""
+    if not fields:
+        return None
+    allowed = set(allowed)
+    requested = {f.strip() for f in fields.split(",") if f.strip()}
+    unknown = requested - allowed
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    return tuple(sorted(requested | {"id", "timestamp"}))
+
+
+def projection_for(fields: Optional[Tuple[str, ...]]) -> dict:
+    projection = {"_id": 0}
+    if fields:
+        projection.update({f: 1 for f in fields})
+    return projection
@@ -0,0 +1,50 @@
+import hashlib
+import json
+from dataclasses import dataclass
+from typing import Any
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+
+@dataclass(frozen=True)
+class StaticPayload:
+    """A JSON document serialized once, with its strong ETag"""
+    body: bytes
+    etag: str
+    media_type: str = "application/json"
+
+
+def build_payload(content: Any) -> StaticPayload:
+    """Serialize content the same way JSONResponse would and hash it"""
+    body = json.dumps(
+        content,
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
+    etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+    return StaticPayload(body=body, etag=etag)
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag (RFC 9110)"""
+    if if_none_match.strip() == "*":
+        return True
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def payload_response(request: Request, payload: StaticPayload) -> Response:
+    """Serve cached bytes, or a bodyless 304 when the client copy is current"""
+    headers = {"ETag": payload.etag, "Cache-Control": "no-cache"}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag_matches(if_none_match, payload.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=payload.body, media_type=payload.media_type, headers=headers)
@@ -1,15 +1,25 @@
-from fastapi import FastAPI, APIRouter, HTTPException
+from fastapi import FastAPI, APIRouter, HTTPException, Query, Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
+import asyncio
 import os
 import logging
 from pathlib import Path
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import Dict, List, Literal, Optional
 import uuid
 from datetime import datetime
 
+from exports import CONTACT_EXPORT_FIELDS, MEDIA_TYPES, STATUS_EXPORT_FIELDS, export_stream
+from pagination import KEYSET_SORT, InvalidCursor, encode_cursor, keyset_filter, parse_fields, projection_for
+from payloads import StaticPayload, build_payload, payload_response
+from singleflight import SingleFlight
+from stats import ContactStatsCache
+from writebehind import WriteBehindQueue
+
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
@@ -144,33 +154,83 @@ portfolio_data = {
     "leadership": "Co-led the content team, overseeing strategy, creation, and quality control across multiple platforms. Collaborated with cross-functional teams to ensure consistent, engaging, and impactful communication."
 }
 
+def build_static_payloads(data: dict) -> Dict[str, StaticPayload]:
+    """Serialize the read-only portfolio routes once so requests only copy bytes"""
+    return {
+        "portfolio": build_payload(data),
+        "skills": build_payload(data["skills"]),
+        "projects": build_payload(data["projects"]),
+        "experience": build_payload(data["experience"]),
+        "education": build_payload(data["education"]),
+    }
+
+def derive_portfolio_stats(data: dict) -> PortfolioStats:
+    """Counts that depend only on portfolio_data"""
+    return PortfolioStats(
+        total_projects=len(data["projects"]),
+        leadership_roles=len(data["experience"]),
+        technologies=len(data["skills"]["technical"]) + len(data["skills"]["programming"]),
+    )
+
+# Serialized once per worker; portfolio_data never changes in-process
+static_payloads = build_static_payloads(portfolio_data)
+base_stats = derive_portfolio_stats(portfolio_data)
+
+contact_stats = ContactStatsCache(
+    db,
+    sync_interval=float(os.environ.get('STATS_SYNC_INTERVAL', '2')),
+    reconcile_interval=float(os.environ.get('STATS_RECONCILE_INTERVAL', '300')),
+)
+
+# Concurrent identical Mongo reads share one query
+read_coalescer = SingleFlight(ttl=float(os.environ.get('SINGLEFLIGHT_TTL', '0.5')))
+
+async def on_contact_messages_flushed(inserted: int):
+    await contact_stats.record_insert(inserted)
+    read_coalescer.forget("contact_messages")
+
+async def on_status_checks_flushed(inserted: int):
+    read_coalescer.forget("status_checks")
+
+def make_write_behind_queue(collection, on_flush) -> WriteBehindQueue:
+    return WriteBehindQueue(
+        collection,
+        max_size=int(os.environ.get('WRITE_BEHIND_MAX_QUEUE', '10000')),
+        batch_size=int(os.environ.get('WRITE_BEHIND_BATCH_SIZE', '100')),
+        flush_interval=float(os.environ.get('WRITE_BEHIND_FLUSH_INTERVAL', '0.05')),
+        on_flush=on_flush,
+    )
+
+# Opt-in: acknowledge POST /api/contact and /api/status before the insert lands
+write_behind_enabled = os.environ.get('WRITE_BEHIND', 'false').lower() in ('1', 'true', 'yes')
+contact_writer: Optional[WriteBehindQueue] = None
+status_writer: Optional[WriteBehindQueue] = None
+if write_behind_enabled:
+    contact_writer = make_write_behind_queue(db.contact_messages, on_contact_messages_flushed)
+    status_writer = make_write_behind_queue(db.status_checks, on_status_checks_flushed)
+
+def enqueue_write(writer: WriteBehindQueue, doc: dict):
+    """Hand a document to the write-behind queue, shedding load when it is full"""
+    try:
+        writer.submit(doc)
+    except asyncio.QueueFull:
+        raise HTTPException(status_code=503, detail="Server busy, please retry",
+                            headers={"Retry-After": "1"})
+
 # API Routes
 @api_router.get("/")
 async def root():
     return {"message": "Dhanyashree Portfolio API", "status": "active"}
 
 @api_router.get("/portfolio")
-async def get_portfolio():
+async def get_portfolio(request: Request):
     """Get complete portfolio data"""
-    return portfolio_data
+    return payload_response(request, static_payloads["portfolio"])
 
 @api_router.get("/portfolio/stats", response_model=PortfolioStats)
 async def get_portfolio_stats():
     """Get portfolio statistics"""
-    try:
-        # Count contact messages
-        message_count = await db.contact_messages.count_documents({})
-        
-        stats = PortfolioStats(
-            total_projects=len(portfolio_data["projects"]),
-            leadership_roles=len(portfolio_data["experience"]),
-            technologies=len(portfolio_data["skills"]["technical"]) + len(portfolio_data["skills"]["programming"]),
-            contact_messages=message_count
-        )
-        return stats
-    except Exception as e:
-        logger.error(f"Error getting stats: {e}")
-        return PortfolioStats()
+    return base_stats.model_copy(update={"contact_messages": contact_stats.count})
 
 @api_router.post("/contact", response_model=ContactMessage)
 async def create_contact_message(contact_data: ContactMessageCreate):
@@ -178,63 +238,148 @@ async def create_contact_message(contact_data: ContactMessageCreate):
     try:
         contact_dict = contact_data.dict()
         contact_obj = ContactMessage(**contact_dict)
-        
+
+        if contact_writer is not None:
+            enqueue_write(contact_writer, contact_obj.dict())
+            logger.info(f"Contact message received from {contact_obj.email}")
+            return contact_obj
+
         # Insert into database
         result = await db.contact_messages.insert_one(contact_obj.dict())
         
         if result.inserted_id:
+            try:
+                await contact_stats.record_insert()
+            except Exception as e:
+                logger.error(f"Error updating contact stats: {e}")
+            read_coalescer.forget("contact_messages")
             logger.info(f"Contact message received from {contact_obj.email}")
             return contact_obj
         else:
             raise HTTPException(status_code=500, detail="Failed to save contact message")
-            
+
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error saving contact message: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
 @api_router.get("/contact/messages", response_model=List[ContactMessage])
-async def get_contact_messages():
-    """Get all contact messages (admin endpoint)"""
+async def get_contact_messages(
+    response: Response,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+):
+    """Get contact messages newest first (admin endpoint)
+
+    Pages are keyed on (timestamp, id); pass the X-Next-Cursor header of one
+    page as ``cursor`` to fetch the next. ``fields`` limits the returned
+    fields and is pushed down to Mongo as a projection.
+    """
     try:
-        messages = await db.contact_messages.find().sort("timestamp", -1).to_list(100)
-        return [ContactMessage(**message) for message in messages]
+        query = keyset_filter(cursor)
+        selected = parse_fields(fields, ContactMessage.model_fields)
+    except InvalidCursor:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    try:
+        messages = await read_coalescer.do(
+            ("contact_messages", "page", limit, cursor, selected),
+            lambda: db.contact_messages.find(query, projection_for(selected))
+            .sort(KEYSET_SORT).limit(limit + 1).to_list(limit + 1),
+        )
     except Exception as e:
         logger.error(f"Error retrieving contact messages: {e}")
         raise HTTPException(status_code=500, detail="Failed to retrieve messages")
 
+    page = messages[:limit]
+    headers = {}
+    if len(messages) > limit:
+        headers["X-Next-Cursor"] = encode_cursor(page[-1])
+    if selected is not None:
+        # Partial documents cannot satisfy ContactMessage validation
+        return JSONResponse(jsonable_encoder(page), headers=headers)
+    response.headers.update(headers)
+    return [ContactMessage(**message) for message in page]
+
+def export_response(collection, fields, name: str, format: str,
+                    since: Optional[datetime], until: Optional[datetime],
+                    gzip: bool) -> StreamingResponse:
+    """Stream a collection export chunk by chunk straight off the Motor cursor"""
+    headers = {"Content-Disposition": f'attachment; filename="{name}.{format}"'}
+    if gzip:
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(
+        export_stream(collection, fields, format, since, until, compress=gzip),
+        media_type=MEDIA_TYPES[format],
+        headers=headers,
+    )
+
+@api_router.get("/contact/messages/export")
+async def export_contact_messages(
+    format: Literal["ndjson", "csv"] = "ndjson",
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    gzip: bool = False,
+):
+    """Export contact messages oldest first as NDJSON or CSV (admin endpoint)"""
+    return export_response(db.contact_messages, CONTACT_EXPORT_FIELDS, "contact_messages",
+                           format, since, until, gzip)
+
 @api_router.get("/skills")
-async def get_skills():
+async def get_skills(request: Request):
     """Get skills categorized by type"""
-    return portfolio_data["skills"]
+    return payload_response(request, static_payloads["skills"])
 
 @api_router.get("/projects")
-async def get_projects():
+async def get_projects(request: Request):
     """Get all projects"""
-    return portfolio_data["projects"]
+    return payload_response(request, static_payloads["projects"])
 
 @api_router.get("/experience")
-async def get_experience():
+async def get_experience(request: Request):
     """Get work experience"""
-    return portfolio_data["experience"]
+    return payload_response(request, static_payloads["experience"])
 
 @api_router.get("/education")
-async def get_education():
+async def get_education(request: Request):
     """Get education details"""
-    return portfolio_data["education"]
+    return payload_response(request, static_payloads["education"])
 
 # Legacy routes for backward compatibility
 @api_router.post("/status", response_model=StatusCheck)
 async def create_status_check(input: StatusCheckCreate):
     status_dict = input.dict()
     status_obj = StatusCheck(**status_dict)
+    if status_writer is not None:
+        enqueue_write(status_writer, status_obj.dict())
+        return status_obj
     _ = await db.status_checks.insert_one(status_obj.dict())
+    read_coalescer.forget("status_checks")
     return status_obj
 
 @api_router.get("/status", response_model=List[StatusCheck])
 async def get_status_checks():
-    status_checks = await db.status_checks.find().to_list(1000)
+    status_checks = await read_coalescer.do(
+        ("status_checks", "all", 1000),
+        lambda: db.status_checks.find().to_list(1000),
+    )
     return [StatusCheck(**status_check) for status_check in status_checks]
 
+@api_router.get("/status/export")
+async def export_status_checks(
+    format: Literal["ndjson", "csv"] = "ndjson",
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    gzip: bool = False,
+):
+    """Export status checks oldest first as NDJSON or CSV"""
+    return export_response(db.status_checks, STATUS_EXPORT_FIELDS, "status_checks",
+                           format, since, until, gzip)
+
 # Include the router in the main app
 app.include_router(api_router)
 
@@ -244,12 +389,25 @@ app.add_middleware(
     allow_origins=["*"],
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 
 
+@app.on_event("startup")
+async def start_background_tasks():
+    await contact_stats.start()
+    for writer in (contact_writer, status_writer):
+        if writer is not None:
+            writer.start()
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
+    # Flush acknowledged writes before the client goes away
+    for writer in (contact_writer, status_writer):
+        if writer is not None:
+            await writer.drain()
+    await contact_stats.stop()
     client.close()
 
 # Health check endpoint
@@ -0,0 +1,55 @@
+import asyncio
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+
+class SingleFlight:
+    """Coalesce concurrent identical reads into one awaitable.
+
+    Callers passing the same key while a call is in flight share its result
+    instead of issuing their own query. Completed results are kept for
+    ``ttl`` seconds so a burst arriving just after the first call finishes
+    is served without another round trip. Keys are tuples whose first item
+    names the collection, so writes can drop everything they invalidate.
+    """
+
+    def __init__(self, ttl: float = 0.5, max_entries: int = 256):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self._results: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        loop = asyncio.get_running_loop()
+        hit = self._results.get(key)
+        if hit is not None:
+            if hit[0] > loop.time():
+                return hit[1]
+            del self._results[key]
+
+        future = self._inflight.get(key)
+        if future is None:
+            # Run the call as its own task so a cancelled caller does not
+            # cancel the query for everyone else waiting on it
+            future = asyncio.ensure_future(fn())
+            self._inflight[key] = future
+            future.add_done_callback(lambda f: self._complete(key, f))
+        return await asyncio.shield(future)
+
+    def _complete(self, key: Hashable, future: asyncio.Future):
+        # A key forgotten mid-flight must not be repopulated with a stale result
+        if self._inflight.get(key) is not future:
+            return
+        del self._inflight[key]
+        if future.cancelled() or future.exception() is not None or self.ttl <= 0:
+            return
+        self._results[key] = (asyncio.get_running_loop().time() + self.ttl, future.result())
+        self._results.move_to_end(key)
+        while len(self._results) > self.max_entries:
+            self._results.popitem(last=False)
+
+    def forget(self, namespace: str):
+        """Drop cached and in-flight results for keys starting with namespace"""
+        for store in (self._results, self._inflight):
+            for key in [k for k in store if isinstance(k, tuple) and k and k[0] == namespace]:
+                del store[key]
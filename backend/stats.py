@@ -0,0 +1,89 @@
+import asyncio
+import logging
+from typing import Optional
+
+from pymongo import ReturnDocument
+
+logger = logging.getLogger(__name__)
+
+
+class ContactStatsCache:
+    """In-process contact message count kept coherent across workers.
+
+    Every successful insert bumps a shared sequence document with ``$inc``.
+    Each worker remembers the count and sequence it last reconciled against,
+    so the current total is ``base_count + (seq - base_seq)``. A background
+    task polls the sequence document cheaply and recounts the collection on
+    a slower interval to correct any drift.
+    """
+
+    def __init__(self, db, sequence_id: str = "contact_messages",
+                 sync_interval: float = 2.0, reconcile_interval: float = 300.0):
+        self.db = db
+        self.sequence_id = sequence_id
+        self.sync_interval = sync_interval
+        self.reconcile_interval = reconcile_interval
+        self.base_count = 0
+        self.base_seq = 0
+        self.seq = 0
+        self.seeded = False
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def count(self) -> int:
+        return self.base_count + (self.seq - self.base_seq)
+
+    async def _read_seq(self) -> int:
+        doc = await self.db.counters.find_one({"_id": self.sequence_id})
+        return doc["seq"] if doc else 0
+
+    async def reconcile(self):
+        """Recount the collection and re-anchor the sequence offset"""
+        seq = await self._read_seq()
+        count = await self.db.contact_messages.count_documents({})
+        self.base_count, self.base_seq, self.seq = count, seq, seq
+        self.seeded = True
+
+    async def record_insert(self, n: int = 1):
+        """Bump the shared sequence after ``n`` successful inserts"""
+        doc = await self.db.counters.find_one_and_update(
+            {"_id": self.sequence_id},
+            {"$inc": {"seq": n}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
+        self.seq = max(self.seq, doc["seq"])
+
+    async def sync(self):
+        """Pick up inserts made by other workers"""
+        self.seq = max(self.seq, await self._read_seq())
+
+    async def _run(self):
+        elapsed = 0.0
+        while True:
+            await asyncio.sleep(self.sync_interval)
+            elapsed += self.sync_interval
+            try:
+                if not self.seeded or elapsed >= self.reconcile_interval:
+                    await self.reconcile()
+                    elapsed = 0.0
+                else:
+                    await self.sync()
+            except Exception as e:
+                logger.error(f"Error refreshing contact stats: {e}")
+
+    async def start(self):
+        try:
+            await self.reconcile()
+        except Exception as e:
+            logger.error(f"Error seeding contact stats: {e}")
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
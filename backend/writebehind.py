@@ -0,0 +1,93 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable, Optional
+
+from pymongo.errors import BulkWriteError
+
+logger = logging.getLogger(__name__)
+
+
+class WriteBehindQueue:
+    """Bounded buffer of documents flushed to a collection in batches.
+
+    Handlers call ``submit`` and return immediately; a background task
+    writes with ``insert_many(ordered=False)`` once ``batch_size`` documents
+    are waiting or ``flush_interval`` seconds have passed since the first
+    one arrived. ``submit`` raises ``asyncio.QueueFull`` when the buffer is
+    full so callers can shed load instead of growing memory.
+    """
+
+    def __init__(self, collection, max_size: int = 10000, batch_size: int = 100,
+                 flush_interval: float = 0.05,
+                 on_flush: Optional[Callable[[int], Awaitable[None]]] = None):
+        self.collection = collection
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.on_flush = on_flush
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_size)
+        self.accepting = False
+        self._task: Optional[asyncio.Task] = None
+
+    def submit(self, doc: dict):
+        if not self.accepting:
+            raise asyncio.QueueFull
+        self.queue.put_nowait(doc)
+
+    async def _next_batch(self) -> list:
+        batch = [await self.queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.flush_interval
+        while len(batch) < self.batch_size:
+            if not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+                continue
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _flush(self, batch: list):
+        inserted = 0
+        try:
+            result = await self.collection.insert_many(batch, ordered=False)
+            inserted = len(result.inserted_ids)
+        except BulkWriteError as e:
+            inserted = e.details.get("nInserted", 0)
+            logger.error(f"Write-behind flush to {self.collection.name} partially failed: "
+                         f"{len(batch) - inserted} of {len(batch)} documents dropped")
+        except Exception as e:
+            logger.error(f"Write-behind flush to {self.collection.name} failed, "
+                         f"{len(batch)} documents dropped: {e}")
+        finally:
+            for _ in batch:
+                self.queue.task_done()
+        if inserted and self.on_flush is not None:
+            try:
+                await self.on_flush(inserted)
+            except Exception as e:
+                logger.error(f"Error in write-behind flush callback: {e}")
+
+    async def _run(self):
+        while True:
+            await self._flush(await self._next_batch())
+
+    def start(self):
+        self.accepting = True
+        self._task = asyncio.create_task(self._run())
+
+    async def drain(self):
+        """Stop accepting documents and wait until everything queued is written"""
+        self.accepting = False
+        if self._task is None:
+            return
+        await self.queue.join()
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
@@ -0,0 +1,161 @@
+"""Minimal in-memory stand-ins for the Motor collections used by server.py"""
+
+import asyncio
+import copy
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+
+def _matches(doc: Dict[str, Any], query: Dict[str, Any]) -> bool:
+    for key, cond in query.items():
+        if key == "$or":
+            if not any(_matches(doc, sub) for sub in cond):
+                return False
+            continue
+        if key == "$and":
+            if not all(_matches(doc, sub) for sub in cond):
+                return False
+            continue
+        value = doc.get(key)
+        if isinstance(cond, dict) and any(k.startswith("$") for k in cond):
+            for op, arg in cond.items():
+                if op == "$lt" and not (value is not None and value < arg):
+                    return False
+                if op == "$lte" and not (value is not None and value <= arg):
+                    return False
+                if op == "$gt" and not (value is not None and value > arg):
+                    return False
+                if op == "$gte" and not (value is not None and value >= arg):
+                    return False
+                if op == "$in" and value not in arg:
+                    return False
+        elif value != cond:
+            return False
+    return True
+
+
+def _project(doc: Dict[str, Any], projection: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    if not projection:
+        return copy.copy(doc)
+    included = [k for k, v in projection.items() if v and k != "_id"]
+    if included:
+        out = {k: doc[k] for k in included if k in doc}
+        if projection.get("_id", 1) and "_id" in doc:
+            out["_id"] = doc["_id"]
+        return out
+    return {k: v for k, v in doc.items() if projection.get(k, 1)}
+
+
+class FakeCursor:
+    def __init__(self, collection: "FakeCollection", query, projection):
+        self.collection = collection
+        self.query = query or {}
+        self.projection = projection
+        self._sort: List = []
+        self._limit = 0
+        self._skip = 0
+
+    def sort(self, key, direction=None):
+        self._sort = list(key) if isinstance(key, list) else [(key, direction or 1)]
+        return self
+
+    def limit(self, n: int):
+        self._limit = n
+        return self
+
+    def skip(self, n: int):
+        self._skip = n
+        return self
+
+    def batch_size(self, n: int):
+        return self
+
+    def _results(self, length: Optional[int] = None):
+        docs = [d for d in self.collection.docs if _matches(d, self.query)]
+        for key, direction in reversed(self._sort):
+            docs.sort(key=lambda d: d.get(key), reverse=direction < 0)
+        docs = docs[self._skip:]
+        for n in (self._limit, length):
+            if n:
+                docs = docs[:n]
+        return [_project(d, self.projection) for d in docs]
+
+    async def to_list(self, length: Optional[int] = None):
+        self.collection.calls["find"] += 1
+        await asyncio.sleep(self.collection.latency)
+        return self._results(length)
+
+    def __aiter__(self):
+        self.collection.calls["find"] += 1
+        return self._iterate()
+
+    async def _iterate(self):
+        for doc in self._results():
+            yield doc
+
+
+class FakeCollection:
+    def __init__(self, latency: float = 0.01):
+        self.docs: List[Dict[str, Any]] = []
+        self.latency = latency
+        self.calls = {"find": 0, "count_documents": 0, "insert": 0}
+
+    def find(self, query=None, projection=None):
+        return FakeCursor(self, query, projection)
+
+    async def find_one(self, query=None, projection=None):
+        for doc in self.docs:
+            if _matches(doc, query or {}):
+                return _project(doc, projection)
+        return None
+
+    async def count_documents(self, query):
+        self.calls["count_documents"] += 1
+        await asyncio.sleep(self.latency)
+        return sum(1 for d in self.docs if _matches(d, query))
+
+    async def insert_one(self, doc):
+        self.calls["insert"] += 1
+        await asyncio.sleep(self.latency)
+        doc.setdefault("_id", len(self.docs) + 1)
+        self.docs.append(doc)
+        return SimpleNamespace(inserted_id=doc["_id"])
+
+    async def insert_many(self, docs, ordered=True):
+        self.calls["insert"] += 1
+        await asyncio.sleep(self.latency)
+        ids = []
+        for doc in docs:
+            doc.setdefault("_id", len(self.docs) + 1)
+            self.docs.append(doc)
+            ids.append(doc["_id"])
+        return SimpleNamespace(inserted_ids=ids)
+
+    async def find_one_and_update(self, query, update, upsert=False, return_document=None):
+        doc = next((d for d in self.docs if _matches(d, query)), None)
+        if doc is None:
+            if not upsert:
+                return None
+            doc = dict(query)
+            self.docs.append(doc)
+        for field, amount in update.get("$inc", {}).items():
+            doc[field] = doc.get(field, 0) + amount
+        for field, value in update.get("$set", {}).items():
+            doc[field] = value
+        return copy.copy(doc)
+
+
+class FakeDatabase:
+    def __init__(self, latency: float = 0.01):
+        self.latency = latency
+        self._collections: Dict[str, FakeCollection] = {}
+
+    def __getattr__(self, name: str) -> FakeCollection:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self[name]
+
+    def __getitem__(self, name: str) -> FakeCollection:
+        if name not in self._collections:
+            self._collections[name] = FakeCollection(self.latency)
+        return self._collections[name]
@@ -0,0 +1,86 @@
+import asyncio
+
+import httpx
+import pytest
+
+import server
+from singleflight import SingleFlight
+from tests.fakes import FakeDatabase
+
+
+def test_concurrent_callers_share_one_call():
+    calls = 0
+
+    async def query():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return ["result"]
+
+    async def main():
+        flight = SingleFlight(ttl=1.0)
+        results = await asyncio.gather(*[flight.do(("k",), query) for _ in range(50)])
+        assert all(r == ["result"] for r in results)
+        # Served from the TTL cache after completion
+        await flight.do(("k",), query)
+
+    asyncio.run(main())
+    assert calls == 1
+
+
+def test_errors_propagate_and_are_not_cached():
+    calls = 0
+
+    async def failing():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        raise RuntimeError("boom")
+
+    async def main():
+        flight = SingleFlight(ttl=1.0)
+        results = await asyncio.gather(*[flight.do(("k",), failing) for _ in range(5)],
+                                       return_exceptions=True)
+        assert all(isinstance(r, RuntimeError) for r in results)
+        with pytest.raises(RuntimeError):
+            await flight.do(("k",), failing)
+
+    asyncio.run(main())
+    assert calls == 2
+
+
+def test_forget_drops_cached_results():
+    calls = 0
+
+    async def query():
+        nonlocal calls
+        calls += 1
+        return calls
+
+    async def main():
+        flight = SingleFlight(ttl=10.0)
+        assert await flight.do(("contact_messages", 1), query) == 1
+        assert await flight.do(("contact_messages", 1), query) == 1
+        flight.forget("contact_messages")
+        assert await flight.do(("contact_messages", 1), query) == 2
+
+    asyncio.run(main())
+
+
+@pytest.mark.parametrize("path,collection", [
+    ("/api/contact/messages", "contact_messages"),
+    ("/api/status", "status_checks"),
+])
+def test_concurrent_requests_issue_one_query(monkeypatch, path, collection):
+    fake_db = FakeDatabase(latency=0.05)
+    monkeypatch.setattr(server, "db", fake_db)
+    monkeypatch.setattr(server, "read_coalescer", SingleFlight(ttl=0.5))
+
+    async def main():
+        transport = httpx.ASGITransport(app=server.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            responses = await asyncio.gather(*[client.get(path) for _ in range(20)])
+        assert all(r.status_code == 200 for r in responses)
+
+    asyncio.run(main())
+    assert fake_db[collection].calls["find"] == 1